@@ -27,11 +27,10 @@ install_raspberry_pi() {
     # Install Python packages system-wide
     echo "📦 Installing Python packages..."
     sudo pip3 install --break-system-packages \
-        praw \
+        asyncpraw \
         requests \
         pillow \
-        python-telegram-bot \
-        schedule \
+        "python-telegram-bot[http2]" \
         httpx \
         python-dotenv
     
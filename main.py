@@ -7,7 +7,8 @@ A tool to scrape memes from Reddit and send them via Telegram
 import os
 import json
 import time
-import schedule
+import signal
+import asyncio
 from dotenv import load_dotenv
 
 from reddit_scraper import RedditScraper
@@ -36,38 +37,63 @@ def main():
     # Send startup notification
     monitor.send_webhook_notification("🚀 Meme scraper started successfully")
     
-    def scrape_and_send():
+    async def scrape_and_send():
         """Function to scrape memes and send them"""
         try:
             logger.info("Starting meme scraping session")
             
-            # Scrape memes from Reddit
-            memes = reddit_scraper.scrape_memes()
+            # Each subreddit's memes are sent as soon as it has been scraped, so
+            # Telegram sends overlap with the subreddits still being fetched
+            queue = asyncio.Queue()
             
-            if memes:
-                logger.info(f"Found {len(memes)} new memes")
-                monitor.update_stats('scraped', count=len(memes))
-                
-                # Send memes via Telegram
-                sent_count = 0
-                failed_count = 0
-                
-                for meme in memes:
-                    try:
-                        telegram_sender.send_memes([meme])
-                        sent_count += 1
-                        monitor.update_stats('sent', count=1, meme=meme)
-                    except Exception as e:
-                        failed_count += 1
-                        monitor.update_stats('failed', count=1, error=e)
-                        logger.error(f"Failed to send meme: {e}")
-                
+            async def produce():
+                try:
+                    async for memes in reddit_scraper.scrape_memes_stream():
+                        await queue.put(memes)
+                finally:
+                    await queue.put(None)
+            
+            async def consume():
+                found = sent_count = failed_count = 0
+                while True:
+                    memes = await queue.get()
+                    if memes is None:
+                        return found, sent_count, failed_count
+                    
+                    found += len(memes)
+                    monitor.update_stats('scraped', count=len(memes), subreddit=memes[0]['subreddit'])
+                    
+                    # Send memes via Telegram (concurrently, one result per meme)
+                    results = await telegram_sender.send_memes_async(memes)
+                    
+                    # Record every result, then refresh the e-ink display once
+                    with monitor.batch():
+                        for meme, error in zip(memes, results):
+                            if error is None:
+                                sent_count += 1
+                                monitor.update_stats('sent', count=1, meme=meme)
+                            else:
+                                failed_count += 1
+                                monitor.update_stats('failed', count=1, error=error)
+            
+            # If sending fails, stop scraping too, rather than leaving the producer to mark
+            # more posts as sent and fill a queue nobody reads
+            producer = asyncio.ensure_future(produce())
+            try:
+                found, sent_count, failed_count = await consume()
+                await producer  # Re-raises a scraping failure
+            finally:
+                if not producer.done():
+                    producer.cancel()
+                    await asyncio.wait([producer])
+            
+            if found:
                 logger.info(f"Sent {sent_count} memes successfully, {failed_count} failed")
                 
                 # Send notification for significant events
                 if failed_count > 0:
                     monitor.send_webhook_notification(
-                        f"⚠️ Sent {sent_count}/{len(memes)} memes. {failed_count} failed.", 
+                        f"⚠️ Sent {sent_count}/{found} memes. {failed_count} failed.", 
                         'warning'
                     )
                 elif sent_count > 0:
@@ -84,17 +110,35 @@ def main():
     
     # Schedule the job
     interval_hours = config.get('schedule', {}).get('interval_hours', 1)
-    schedule.every(interval_hours).hours.do(scrape_and_send)
+    interval_seconds = interval_hours * 3600
     
     logger.info(f"Scheduler set up to run every {interval_hours} hour(s)")
     
-    # Run once immediately
-    scrape_and_send()
+    async def run_forever():
+        """Run once immediately, then sleep until exactly the next slot"""
+        # systemd stops the service with SIGTERM. Cancelling this task lets the cleanup
+        # below and the atexit hooks (which blank the e-ink display) run before exit.
+        try:
+            asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
+        except NotImplementedError:
+            pass  # Windows event loops don't support signal handlers
+        
+        # Deadlines are kept on the monotonic clock so runs don't drift or jump with NTP
+        next_run = time.monotonic()
+        try:
+            while True:
+                await scrape_and_send()
+                next_run = max(next_run + interval_seconds, time.monotonic())
+                await asyncio.sleep(max(0, next_run - time.monotonic()))
+        finally:
+            await reddit_scraper.close()
+            await telegram_sender.close()
     
-    # Keep the script running
-    while True:
-        schedule.run_pending()
-        time.sleep(60)  # Check every minute
+    # Reddit and Telegram I/O share one event loop for the life of the process
+    try:
+        asyncio.run(run_forever())
+    except asyncio.CancelledError:
+        logger.info("Received SIGTERM, shutting down")
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -25,11 +25,10 @@ fi
 # Install system packages
 echo "📦 Installing system-wide packages..."
 sudo pip3 install --break-system-packages \
-    praw \
+    asyncpraw \
     requests \
     pillow \
-    python-telegram-bot \
-    schedule \
+    "python-telegram-bot[http2]" \
     httpx \
     python-dotenv \
     RPi.GPIO \
@@ -54,7 +53,7 @@ fi
 
 # Test the setup
 echo "🧪 Testing system installation..."
-if python3 -c "import praw, telegram, PIL; print('✅ Core packages OK')"; then
+if python3 -c "import asyncpraw, telegram, PIL; print('✅ Core packages OK')"; then
     echo "✅ Core packages working"
 else
     echo "❌ Core packages test failed"
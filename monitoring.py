@@ -1,12 +1,26 @@
 import os
 import json
 import logging
-import requests
+import atexit
 from datetime import datetime, timedelta
 from typing import Dict, Any, Optional
 import threading
+import queue
 import time
 import random
+import heapq
+from io import BytesIO
+from collections import deque, OrderedDict
+from contextlib import contextmanager
+from utils import dumps_json, backoff_delay, RETRY_MAX_ATTEMPTS, RETRY_BACKOFF_CAP
+
+# Webhook responses worth retrying (with utils.backoff_delay between attempts)
+WEBHOOK_RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+def _uptime_parts(uptime_start: float):
+    """Split the time elapsed since a monotonic start into whole days and hours"""
+    days, remainder = divmod(int(time.monotonic() - uptime_start), 86400)
+    return days, remainder // 3600
 
 class MonitoringManager:
     def __init__(self, config: Dict[str, Any]):
@@ -16,41 +30,95 @@ class MonitoringManager:
             'scraped': 0,
             'sent': 0,
             'failed': 0,
-            'last_run': None,
-            'uptime_start': datetime.now(),
-            'errors': [],
+            'last_run': None,  # Epoch seconds, formatted only when displayed
+            'uptime_start': time.monotonic(),
+            'errors': deque(maxlen=10),  # Keeps only the last 10 errors
             'subreddit_stats': {},
+            'top_subreddits': [],  # (subreddit, count) leaders, refreshed on each scrape
             'last_error': None,
-            'recent_memes': [],
+            'recent_memes': deque(maxlen=5),  # Keeps only the last 5 sent memes
             'best_meme_today': None
         }
+        # Guards self.stats; readers take a snapshot instead of holding it
+        self._stats_lock = threading.Lock()
+        # Set while inside batch() so per-event display refreshes are skipped
+        self._suspend_display = False
+        # Wakes the display thread early when stats change; only that thread draws
+        self._display_wake = threading.Event()
+        # Set by close() to stop the display thread
+        self._stop = threading.Event()
+        self._display_thread = None
+        
+        # Webhook settings are fixed for the process, so resolve them once
+        monitoring_config = self.config.get('monitoring') or {}
+        webhook_config = monitoring_config.get('webhook') or {}
+        self._webhook_enabled = bool(webhook_config.get('enabled', False))
+        self._webhook_url = webhook_config.get('url')
+        if self._webhook_enabled and not self._webhook_url:
+            self.logger.warning("Webhook URL not configured")
+            self._webhook_enabled = False
+        
+        # Payload shape depends only on the webhook type, so pick it once
+        self._format_webhook = self._webhook_formatter(webhook_config.get('type', 'slack'))
         
         # Try to import e-ink display modules
         self.display = None
         self._init_display()
         
-        # Start background monitoring thread
-        if self.config.get('monitoring', {}).get('enabled', False):
-            self._start_monitoring_thread()
+        # One pooled session serves webhook posts and the display's meme downloads
+        self._http = None
+        if self._webhook_enabled or (self.display and self.display.show_meme_images):
+            self._http = self._create_http_session()
+        if self.display:
+            self.display.http = self._http
+        
+        # Webhook posts are handed to a background worker so callers never block
+        self._webhook_queue = queue.Queue(maxsize=100)
+        if self._webhook_enabled:
+            threading.Thread(target=self._webhook_worker, daemon=True).start()
+        
+        # Daily report runs off a timer when monitoring is enabled
+        if monitoring_config.get('enabled', False):
+            self._schedule_daily_report()
+            self.logger.info("Daily report scheduled")
+        
+        # Start background display thread
+        if self.display:
+            self._start_display_thread()
+            atexit.register(self.close)
+    
+    @staticmethod
+    def _create_http_session():
+        """Build the pooled session used for webhook posts and image downloads"""
+        # requests is only imported when something needs HTTP, keeping startup light
+        import requests
+        from requests.adapters import HTTPAdapter
+        
+        # Reuse one pooled session so connections stay warm. Retries are left to the
+        # callers: _post_webhook backs off itself, and a failed meme download is
+        # simply retried on the display's next rotation.
+        session = requests.Session()
+        session.headers.update({'User-Agent': 'RedditMemeScraper/1.0'})
+        session.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=2))
+        return session
     
     def _init_display(self):
         """Initialize e-ink display if available"""
         try:
-            if not self.config.get('display', {}).get('enabled', False):
+            display_config = self.config.get('display') or {}
+            if not display_config.get('enabled', False):
                 return
             
-            # Try to import Waveshare e-ink libraries (common for pwnagotchi)
-            from PIL import Image, ImageDraw, ImageFont
-            import sys
-            
             # Check if we're on a Raspberry Pi
             if not os.path.exists('/proc/device-tree/model'):
                 self.logger.info("Not on Raspberry Pi, skipping display init")
                 return
             
             # Try different display types
-            display_type = self.config.get('display', {}).get('type', 'epd2in13_V3')
+            display_type = display_config.get('type', 'epd2in13_V3')
             
+            # Try to import Waveshare e-ink libraries (common for pwnagotchi).
+            # PIL is imported by FunEInkDisplay itself, only once a panel is found.
             if display_type == 'epd2in13_V3':
                 from waveshare_epd import epd2in13_V3
                 self.display = FunEInkDisplay(epd2in13_V3.EPD(), 'epd2in13_V3', self.config)
@@ -70,73 +138,114 @@ class MonitoringManager:
         except Exception as e:
             self.logger.warning(f"Failed to initialize display: {e}")
     
-    def _start_monitoring_thread(self):
-        """Start background thread for periodic updates"""
-        def monitor_loop():
-            while True:
+    def _start_display_thread(self):
+        """Start the thread that owns all drawing on the display"""
+        def display_loop():
+            while not self._stop.is_set():
                 try:
-                    # Update display every 2 minutes instead of 30 seconds for stability
-                    if self.display:
-                        self._update_display()
-                    
-                    # Send daily reports
-                    if self._should_send_daily_report():
-                        self.send_daily_report()
-                    
-                    time.sleep(120)  # 2 minutes - much more stable for e-ink
+                    self._display_wake.clear()
+                    self._update_display()
+                    # Redraw every 2 minutes for screen rotation, or sooner when stats change
+                    if self._display_wake.wait(120) and not self._stop.is_set():
+                        # Coalesce bursts: hold the redraw until the panel may refresh again
+                        self._stop.wait(self.display.seconds_until_refresh())
                 except Exception as e:
-                    self.logger.error(f"Monitoring thread error: {e}")
-                    time.sleep(300)  # 5 minutes on error
+                    self.logger.error(f"Display thread error: {e}")
+                    self._stop.wait(300)  # 5 minutes on error
+            
+            # Only this thread touches the panel, so it also shuts it down
+            self.display.close()
         
-        thread = threading.Thread(target=monitor_loop, daemon=True)
-        thread.start()
-        self.logger.info("Monitoring thread started (2-minute intervals for display stability)")
+        self._display_thread = threading.Thread(target=display_loop, daemon=True)
+        self._display_thread.start()
+        self.logger.info("Display thread started (2-minute intervals for display stability)")
+    
+    def close(self):
+        """Stop the display thread, leaving the panel blank and asleep"""
+        self._stop.set()
+        self._display_wake.set()
+        if self._display_thread:
+            self._display_thread.join(timeout=30)
+    
+    def _schedule_daily_report(self):
+        """Arm a one-shot timer for the next daily report"""
+        timer = threading.Timer(self._seconds_until_daily_report(), self._fire_daily_report)
+        timer.daemon = True
+        timer.start()
+    
+    def _fire_daily_report(self):
+        """Send the daily report and re-arm the timer for the next day"""
+        try:
+            self.send_daily_report()
+        except Exception as e:
+            self.logger.error(f"Daily report failed: {e}")
+        finally:
+            # A new reporting day starts with no best meme
+            with self._stats_lock:
+                self.stats['best_meme_today'] = None
+            self._schedule_daily_report()
     
     def update_stats(self, event_type: str, **kwargs):
         """Update monitoring statistics"""
-        if event_type == 'scraped':
-            self.stats['scraped'] += kwargs.get('count', 1)
-            subreddit = kwargs.get('subreddit')
-            if subreddit:
-                self.stats['subreddit_stats'][subreddit] = self.stats['subreddit_stats'].get(subreddit, 0) + kwargs.get('count', 1)
-        
-        elif event_type == 'sent':
-            self.stats['sent'] += kwargs.get('count', 1)
-            # Track recent memes
-            meme = kwargs.get('meme')
-            if meme:
-                self.stats['recent_memes'].append({
-                    'title': meme.get('title', '')[:30],
-                    'subreddit': meme.get('subreddit', ''),
-                    'score': meme.get('score', 0),
-                    'url': meme.get('url', ''),  # Add URL for display
-                    'sent_at': datetime.now()
-                })
-                # Keep only last 5 memes
-                self.stats['recent_memes'] = self.stats['recent_memes'][-5:]
+        # One epoch timestamp per event; it is only formatted when displayed
+        now = int(time.time())
+        with self._stats_lock:
+            if event_type == 'scraped':
+                self.stats['scraped'] += kwargs.get('count', 1)
+                subreddit = kwargs.get('subreddit')
+                if subreddit:
+                    self.stats['subreddit_stats'][subreddit] = self.stats['subreddit_stats'].get(subreddit, 0) + kwargs.get('count', 1)
+                    # Counts only change here, so rank once instead of on every frame
+                    self.stats['top_subreddits'] = heapq.nlargest(
+                        5, self.stats['subreddit_stats'].items(), key=lambda x: x[1]
+                    )
+        
+            elif event_type == 'sent':
+                self.stats['sent'] += kwargs.get('count', 1)
+                # Track recent memes
+                meme = kwargs.get('meme')
+                if meme:
+                    # Keep a small summary rather than the full scraped meme dict
+                    summary = {
+                        'title': meme.get('title', '')[:30],
+                        'subreddit': meme.get('subreddit', ''),
+                        'score': meme.get('score', 0),
+                        'url': meme.get('url', ''),  # Add URL for display
+                        'sent_at': now
+                    }
+                    self.stats['recent_memes'].append(summary)
                 
-                # Track best meme of the day
-                if not self.stats['best_meme_today'] or meme.get('score', 0) > self.stats['best_meme_today'].get('score', 0):
-                    self.stats['best_meme_today'] = meme
-        
-        elif event_type == 'failed':
-            self.stats['failed'] += kwargs.get('count', 1)
-            error = kwargs.get('error')
-            if error:
-                self.stats['last_error'] = str(error)
-                self.stats['errors'].append({
-                    'timestamp': datetime.now().isoformat(),
-                    'error': str(error)
-                })
-                # Keep only last 10 errors
-                self.stats['errors'] = self.stats['errors'][-10:]
-        
-        elif event_type == 'run_complete':
-            self.stats['last_run'] = datetime.now()
-        
-        # Update display if available
-        if self.display and event_type in ['sent', 'failed', 'run_complete']:
-            self._update_display()
+                    # Track best meme of the day
+                    if not self.stats['best_meme_today'] or summary['score'] > self.stats['best_meme_today']['score']:
+                        self.stats['best_meme_today'] = summary
+        
+            elif event_type == 'failed':
+                self.stats['failed'] += kwargs.get('count', 1)
+                error = kwargs.get('error')
+                if error:
+                    self.stats['last_error'] = str(error)
+                    self.stats['errors'].append({
+                        'timestamp': now,
+                        'error': str(error)
+                    })
+        
+            elif event_type == 'run_complete':
+                self.stats['last_run'] = now
+        
+        # Wake the display thread to show the change
+        if self.display and not self._suspend_display and event_type in ['sent', 'failed', 'run_complete']:
+            self._display_wake.set()
+    
+    @contextmanager
+    def batch(self):
+        """Hold display refreshes while recording a batch of stats, then refresh once"""
+        self._suspend_display = True
+        try:
+            yield self
+        finally:
+            self._suspend_display = False
+            if self.display:
+                self._display_wake.set()
     
     def _update_display(self):
         """Update e-ink display with current stats"""
@@ -144,70 +253,156 @@ class MonitoringManager:
             return
         
         try:
-            self.display.update_stats(self.stats)
+            self.display.update_stats(self._snapshot_stats())
         except Exception as e:
             self.logger.error(f"Display update failed: {e}")
     
+    def _snapshot_stats(self) -> Dict[str, Any]:
+        """Copy stats under the lock so readers never see a half-applied update"""
+        with self._stats_lock:
+            snapshot = dict(self.stats)
+            snapshot['errors'] = list(self.stats['errors'])
+            snapshot['recent_memes'] = list(self.stats['recent_memes'])
+            snapshot['subreddit_stats'] = dict(self.stats['subreddit_stats'])
+        return snapshot
+    
     def send_webhook_notification(self, message: str, level: str = 'info'):
-        """Send webhook notification"""
-        webhook_config = self.config.get('monitoring', {}).get('webhook', {})
-        if not webhook_config.get('enabled', False):
-            return
-        
-        webhook_url = webhook_config.get('url')
-        if not webhook_url:
-            self.logger.warning("Webhook URL not configured")
+        """Queue a webhook notification for background delivery"""
+        if not self._webhook_enabled:
             return
         
         try:
-            # Format for different webhook types
-            webhook_type = webhook_config.get('type', 'slack')
-            
-            if webhook_type == 'slack':
-                payload = {
-                    'text': f"🤖 Reddit Meme Scraper: {message}",
-                    'username': 'Meme Bot'
-                }
-            elif webhook_type == 'discord':
-                payload = {
-                    'content': f"🤖 **Reddit Meme Scraper**: {message}"
-                }
-            else:  # Generic
-                payload = {'message': message, 'level': level}
+            self._webhook_queue.put_nowait((message, level))
+        except queue.Full:
+            # Drop the oldest pending notification so the latest status gets through
+            self.logger.warning("Webhook queue full, dropping oldest notification")
+            try:
+                self._webhook_queue.get_nowait()
+                self._webhook_queue.task_done()
+                self._webhook_queue.put_nowait((message, level))
+            except (queue.Empty, queue.Full):
+                pass
+    
+    def _webhook_worker(self):
+        """Deliver queued webhook notifications one at a time"""
+        while True:
+            message, level = self._webhook_queue.get()
+            try:
+                self._post_webhook(message, level)
+            finally:
+                self._webhook_queue.task_done()
+    
+    def _post_webhook(self, message: str, level: str):
+        """POST a single notification, retrying transient failures with backoff"""
+        import requests
+        
+        body = dumps_json(self._format_webhook(message, level))
+        for attempt in range(RETRY_MAX_ATTEMPTS):
+            retry_after = None
+            try:
+                response = self._http.post(
+                    self._webhook_url,
+                    data=body,
+                    headers={'Content-Type': 'application/json'},
+                    timeout=10
+                )
+                if response.status_code not in WEBHOOK_RETRY_STATUSES:
+                    response.raise_for_status()
+                    return
+                error = f"HTTP {response.status_code}"
+                retry_after = response.headers.get('Retry-After')
+            except (requests.ConnectionError, requests.Timeout) as e:
+                error = e
+            except Exception as e:
+                # Other 4xx responses and bad URLs will not succeed on retry
+                self.logger.error(f"Webhook notification failed: {e}")
+                return
             
-            response = requests.post(webhook_url, json=payload, timeout=10)
-            response.raise_for_status()
+            if attempt == RETRY_MAX_ATTEMPTS - 1:
+                break
             
-        except Exception as e:
-            self.logger.error(f"Webhook notification failed: {e}")
+            # Capped exponential backoff with full jitter; a server's Retry-After wins
+            delay = backoff_delay(attempt)
+            if retry_after and retry_after.isdigit():
+                delay = min(float(retry_after), RETRY_BACKOFF_CAP)
+            self.logger.warning(f"Webhook delivery failed ({error}), retrying in {delay:.1f}s")
+            time.sleep(delay)
+        
+        self.logger.error(f"Webhook notification failed after {RETRY_MAX_ATTEMPTS} attempts: {error}")
+    
+    @staticmethod
+    def _webhook_formatter(webhook_type: str):
+        """Return a function building the payload for the given webhook type"""
+        # Format for different webhook types
+        if webhook_type == 'slack':
+            prefix = "🤖 Reddit Meme Scraper: "
+            return lambda message, level: {'text': prefix + message, 'username': 'Meme Bot'}
+        if webhook_type == 'discord':
+            prefix = "🤖 **Reddit Meme Scraper**: "
+            return lambda message, level: {'content': prefix + message}
+        # Generic
+        return lambda message, level: {'message': message, 'level': level}
     
     def send_daily_report(self):
         """Send daily statistics report"""
-        uptime = datetime.now() - self.stats['uptime_start']
+        # Nowhere to send it, so skip the snapshot and formatting
+        if not self._webhook_enabled:
+            return
+        
+        stats = self._snapshot_stats()
+        uptime_days, uptime_hours = _uptime_parts(stats['uptime_start'])
         
-        report = f"📊 Daily Report\n"
-        report += f"Uptime: {uptime.days}d {uptime.seconds//3600}h\n"
-        report += f"Scraped: {self.stats['scraped']} memes\n"
-        report += f"Sent: {self.stats['sent']} memes\n"
-        report += f"Failed: {self.stats['failed']} memes\n"
+        lines = [
+            "📊 Daily Report",
+            f"Uptime: {uptime_days}d {uptime_hours}h",
+            f"Scraped: {stats['scraped']} memes",
+            f"Sent: {stats['sent']} memes",
+            f"Failed: {stats['failed']} memes",
+        ]
         
-        if self.stats['subreddit_stats']:
-            top_subreddit = max(self.stats['subreddit_stats'].items(), key=lambda x: x[1])
-            report += f"Top subreddit: r/{top_subreddit[0]} ({top_subreddit[1]} memes)\n"
+        if stats['top_subreddits']:
+            top_subreddit = stats['top_subreddits'][0]
+            lines.append(f"Top subreddit: r/{top_subreddit[0]} ({top_subreddit[1]} memes)")
         
-        if self.stats['best_meme_today']:
-            report += f"Best meme: {self.stats['best_meme_today']['score']} upvotes\n"
+        if stats['best_meme_today']:
+            lines.append(f"Best meme: {stats['best_meme_today']['score']} upvotes")
         
-        if self.stats['last_error']:
-            report += f"Last error: {self.stats['last_error'][:100]}...\n"
+        if stats['last_error']:
+            lines.append(f"Last error: {stats['last_error'][:100]}...")
         
+        # Every line, including the last, ends with a newline
+        report = "\n".join(lines) + "\n"
         self.send_webhook_notification(report, 'info')
     
-    def _should_send_daily_report(self):
-        """Check if it's time to send daily report"""
+    def _seconds_until_daily_report(self):
+        """Seconds until the next daily report is due (9 AM)"""
         now = datetime.now()
-        return now.hour == 9 and now.minute < 5  # Send at 9 AM daily
+        target = now.replace(hour=9, minute=0, second=0, microsecond=0)
+        # Require a minute of headroom so a wake-up just before 9 AM can't fire twice
+        if target - now < timedelta(minutes=1):
+            target += timedelta(days=1)
+        return (target - now).total_seconds()
+
+
+# Largest meme image the display will download (bigger files are skipped)
+MAX_MEME_IMAGE_BYTES = 2 * 1024 * 1024
+
+# Processed meme images kept for the meme display screen (about 2 KB each)
+MEME_IMAGE_CACHE_SIZE = 16
+
+# Main stats rows: (y, static label, stats key). Labels are baked into the
+# screen's template; each frame only draws the number after them.
+MAIN_STATS_ROWS = (
+    (35, "📥 Scraped: ", 'scraped'),
+    (53, "📤 Sent: ", 'sent'),
+    (71, "❌ Failed: ", 'failed'),
+)
 
+# Grayscale -> 1-bit threshold at mid-gray, as a lookup table for Image.point
+THRESHOLD_LUT = [0] * 128 + [255] * 128
+
+# SPI clock used when display.fast_spi is set; the Waveshare drivers default to 4 MHz
+FAST_SPI_HZ = 32000000
 
 class FunEInkDisplay:
     def __init__(self, epd_driver, display_type, config=None):
@@ -218,10 +413,11 @@ class FunEInkDisplay:
         self.height = epd_driver.width
         self.animation_frame = 0
         self.current_meme_index = 0
-        self.cached_memes = []  # Cache for downloaded meme images
-        self.last_refresh_time = 0
-        self.full_refresh_counter = 0
-        self.previous_image = None  # Store previous image to compare
+        self.cached_memes = OrderedDict()  # url -> processed 1-bit image, least recent first
+        self.last_refresh_time = float('-inf')  # Monotonic; -inf so the first refresh is never rate limited
+        self.previous_frame = None  # Bytes of the frame on the panel, to compare
+        self._last_render_key = None  # Stats summary behind the frame on the panel
+        self.http = None  # Shared requests.Session, set by MonitoringManager
         
         # Check if meme images should be displayed
         self.show_meme_images = self.config.get('display', {}).get('show_meme_images', True)
@@ -230,8 +426,21 @@ class FunEInkDisplay:
         display_config = self.config.get('display', {})
         self.min_refresh_interval = display_config.get('refresh_interval_minutes', 2) * 60  # Convert to seconds
         self.mode_change_interval = display_config.get('mode_change_minutes', 5) * 60  # Convert to seconds
-        self.full_refresh_every = 6  # Full refresh every 6 updates (reduces ghosting)
+        self.full_refresh_every = display_config.get('full_refresh_every', 6)  # Full refresh every N updates (reduces ghosting)
         self.enable_partial_refresh = display_config.get('enable_partial_refresh', True)
+        self.fast_spi = display_config.get('fast_spi', False)
+        
+        # Partial refresh needs the driver's displayPartial/displayPartBaseImage pair;
+        # the panel then only flips the pixels that differ from the base frame
+        self._display_partial = getattr(epd_driver, 'displayPartial', None)
+        self._display_base = getattr(epd_driver, 'displayPartBaseImage', None)
+        if self._display_partial is None:
+            self.enable_partial_refresh = False
+        # Start as if a full refresh is due, so the first frame sets the partial base
+        self.full_refresh_counter = self.full_refresh_every
+        
+        # Whether the panel has the partial waveform loaded (cleared by a full init)
+        self._partial_mode = False
         
         # Import PIL here since it's only needed if display is available
         from PIL import Image, ImageDraw, ImageFont
@@ -243,6 +452,7 @@ class FunEInkDisplay:
         self.meme_faces = ["(͡° ͜ʖ ͡°)", "ಠ_ಠ", "¯\\_(ツ)_/¯", "( ͡° ͡°)", "◉_◉", "ಥ_ಥ"]
         self.success_emojis = ["🎉", "🚀", "✨", "🔥", "💯", "🎊"]
         self.error_faces = ["(╯°□°）╯", "¯\\_(ツ)_/¯", "(┛ಠ_ಠ)┛", "ಠ╭╮ಠ"]
+        self._pick_faces()
         
         # Try to load fonts
         try:
@@ -256,10 +466,73 @@ class FunEInkDisplay:
             self.font_small = ImageFont.load_default()
             self.font_medium = ImageFont.load_default()
             self.font_large = ImageFont.load_default()
+        
+        # Panel geometry is fixed, so bottom-anchored rows are placed once
+        self._uptime_y = self.height - 35
+        self._last_run_y = self.height - 20
+        self._footer_y = self.height - 15
+        
+        # Static border and title of every screen, rendered once
+        self._build_templates()
+        
+        # One framebuffer is reused for every frame; templates are pasted over it
+        self._frame = self.Image.new('1', (self.width, self.height), 255)
+        self._frame_draw = self.ImageDraw.Draw(self._frame)
+        self._text_sizes = {}  # (text, font) -> (width, height) for fixed strings
+    
+    def _build_templates(self):
+        """Pre-render each screen's static chrome so frames only draw live values"""
+        def template(title=None, centered=False):
+            image = self.Image.new('1', (self.width, self.height), 255)
+            draw = self.ImageDraw.Draw(image)
+            self._draw_border(draw)
+            if title:
+                x = 10
+                if centered:
+                    title_bbox = draw.textbbox((0, 0), title, font=self.font_medium)
+                    x = (self.width - (title_bbox[2] - title_bbox[0])) // 2
+                draw.text((x, 8), title, font=self.font_medium, fill=0)
+            return image
+        
+        self._border_template = template()
+        self._templates = {
+            0: template("🎭 MEME STATS 🎭", centered=True),
+            1: template("🔥 RECENT MEMES 🔥"),
+            2: template("🏆 TOP SUBREDDITS"),
+            3: self._border_template,
+            4: template("🎭 MEME DISPLAY 🎭"),
+        }
+        
+        # Main stats labels go into that screen's template; remember where each number starts
+        draw = self.ImageDraw.Draw(self._templates[0])
+        self._main_stats_rows = []
+        for y, label, key in MAIN_STATS_ROWS:
+            draw.text((10, y), label, font=self.font_small, fill=0)
+            self._main_stats_rows.append((10 + draw.textlength(label, font=self.font_small), y, key))
+        
+        # Meme image screen uses a plain frame to leave room for the picture
+        self._image_template = self.Image.new('1', (self.width, self.height), 255)
+        self.ImageDraw.Draw(self._image_template).rectangle([0, 0, self.width-1, self.height-1], outline=0, width=1)
+    
+    def _start_frame(self, template):
+        """Reset the shared framebuffer to a template and return it with its draw handle"""
+        self._frame.paste(template)
+        return self._frame, self._frame_draw
+    
+    def _measure(self, text, font):
+        """Width and height of a fixed string, measured once per font"""
+        key = (text, id(font))
+        size = self._text_sizes.get(key)
+        if size is None:
+            bbox = self._frame_draw.textbbox((0, 0), text, font=font)
+            size = self._text_sizes[key] = (bbox[2] - bbox[0], bbox[3] - bbox[1])
+        return size
     
     def init(self):
         """Initialize the display"""
-        self.epd.init()
+        self._full_init()
+        if self.fast_spi:
+            print(f"SPI clock raised to {FAST_SPI_HZ // 1000000} MHz")
         
         # Clear display once at startup
         self.epd.Clear(0xFF)
@@ -267,14 +540,37 @@ class FunEInkDisplay:
         # Show startup message (only once)
         self._show_startup_animation()
         
-        # Initialize partial refresh if supported
-        try:
-            if hasattr(self.epd, 'init_partial'):
-                self.epd.init_partial()
-                print("Partial refresh mode enabled")
-        except:
+        if self.enable_partial_refresh:
+            print("Partial refresh mode enabled")
+        else:
             print("Partial refresh not supported, using full refresh")
-            self.enable_partial_refresh = False
+    
+    def _full_init(self):
+        """Run the driver's full init, which also loads the full-refresh waveform"""
+        self.epd.init()
+        self._partial_mode = False
+        
+        # epd.init() sets the driver's SPI clock, so any override has to come after it
+        if self.fast_spi:
+            self._enable_fast_spi()
+    
+    def _enable_fast_spi(self):
+        """Raise the SPI clock so frame buffers reach the panel faster"""
+        try:
+            from waveshare_epd import epdconfig
+            epdconfig.SPI.max_speed_hz = FAST_SPI_HZ
+        except Exception as e:
+            print(f"Fast SPI not available, keeping driver default: {e}")
+            self.fast_spi = False
+    
+    def _getbuffer(self, image):
+        """Pack a landscape frame into the panel's 1-bit buffer layout.
+        
+        Same layout as the Waveshare drivers' getbuffer (rotated to portrait,
+        MSB first, 1 = white), but packed by PIL in C; some drivers (epd2in7)
+        build the buffer with a per-pixel Python loop.
+        """
+        return bytearray(image.rotate(90, expand=True).convert('1').tobytes('raw'))
     
     def _show_startup_animation(self):
         """Show animated startup sequence"""
@@ -286,16 +582,11 @@ class FunEInkDisplay:
         ]
         
         for i, text in enumerate(frames):
-            image = self.Image.new('1', (self.width, self.height), 255)
-            draw = self.ImageDraw.Draw(image)
-            
             # Fun border
-            self._draw_border(draw)
+            image, draw = self._start_frame(self._border_template)
             
             # Centered text
-            text_bbox = draw.textbbox((0, 0), text, font=self.font_medium)
-            text_width = text_bbox[2] - text_bbox[0]
-            text_height = text_bbox[3] - text_bbox[1]
+            text_width, text_height = self._measure(text, self.font_medium)
             x = (self.width - text_width) // 2
             y = (self.height - text_height) // 2
             
@@ -305,23 +596,27 @@ class FunEInkDisplay:
             dots = "." * ((i % 3) + 1)
             draw.text((x, y + 25), dots, font=self.font_small, fill=0)
             
-            self.epd.display(self.epd.getbuffer(image))
+            self.epd.display(self._getbuffer(image))
             time.sleep(1)
     
     def update_stats(self, stats):
         """Update display with fun, dynamic statistics"""
         # Only change display mode occasionally to reduce flicker
-        import time
-        current_time = time.time()
+        current_time = time.monotonic()
         
         # Change display mode based on configuration (default: every 5 minutes)
         if current_time - self.last_refresh_time >= self.mode_change_interval:
             # Determine number of display modes based on configuration
             max_modes = 5 if self.show_meme_images else 4
             self.animation_frame = (self.animation_frame + 1) % max_modes
+            self._pick_faces()
+        
+        # Skip rendering entirely when the screen would look the same
+        render_key = self._render_key(stats)
+        if render_key == self._last_render_key:
+            return
         
-        image = self.Image.new('1', (self.width, self.height), 255)
-        draw = self.ImageDraw.Draw(image)
+        image, draw = self._start_frame(self._templates[self.animation_frame])
         
         if self.animation_frame == 0:
             self._draw_main_stats(draw, stats)
@@ -332,11 +627,41 @@ class FunEInkDisplay:
         elif self.animation_frame == 3:
             self._draw_fun_status(draw, stats)
         elif self.animation_frame == 4 and self.show_meme_images:
-            self._draw_meme_display_stable(draw, stats)
-            return  # _draw_meme_display_stable handles its own refresh
+            # _draw_meme_display_stable handles its own refresh
+            if self._draw_meme_display_stable(draw, stats):
+                self._last_render_key = render_key
+            return
         
         # Use smart refresh instead of direct display
-        self._smart_refresh(image)
+        if self._smart_refresh(image):
+            self._last_render_key = render_key
+    
+    def _pick_faces(self):
+        """Choose this mode's faces once, so they stay put between refreshes"""
+        self._meme_face = random.choice(self.meme_faces)
+        self._error_face = random.choice(self.error_faces)
+        self._success_emoji = random.choice(self.success_emojis)
+    
+    def _render_key(self, stats):
+        """Summarize what the current screen shows, for change detection"""
+        frame = self.animation_frame
+        if frame == 0:
+            last_run = stats['last_run'] // 60 if stats['last_run'] else None
+            return (frame, stats['scraped'], stats['sent'], stats['failed'], last_run,
+                    _uptime_parts(stats['uptime_start']))
+        if frame == 1:
+            return (frame, tuple((m['title'], m['subreddit'], m['score']) for m in stats['recent_memes'][-3:]))
+        if frame == 2:
+            return (frame, tuple(stats['top_subreddits']))
+        if frame == 3:
+            return (frame, bool(stats['last_error']), stats['sent'], time.strftime("%H:%M"))
+        
+        # Meme display: which meme is up next
+        recent_memes = stats.get('recent_memes')
+        if not recent_memes:
+            return (frame, None)
+        index = self.current_meme_index if self.current_meme_index < len(recent_memes) else 0
+        return (frame, index, recent_memes[index].get('url'))
     
     def _draw_border(self, draw, style='fancy'):
         """Draw decorative borders"""
@@ -357,46 +682,29 @@ class FunEInkDisplay:
     
     def _draw_main_stats(self, draw, stats):
         """Main statistics screen with fun elements"""
-        self._draw_border(draw)
-        
-        # Title with emoji
-        title = f"🎭 MEME STATS 🎭"
-        title_bbox = draw.textbbox((0, 0), title, font=self.font_medium)
-        title_width = title_bbox[2] - title_bbox[0]
-        draw.text(((self.width - title_width) // 2, 8), title, font=self.font_medium, fill=0)
-        
-        # Stats with fun formatting
-        y = 35
-        draw.text((10, y), f"📥 Scraped: {stats['scraped']}", font=self.font_small, fill=0)
-        y += 18
-        draw.text((10, y), f"📤 Sent: {stats['sent']}", font=self.font_small, fill=0)
-        y += 18
-        draw.text((10, y), f"❌ Failed: {stats['failed']}", font=self.font_small, fill=0)
+        # Stats with fun formatting (labels come from the template)
+        for x, y, key in self._main_stats_rows:
+            draw.text((x, y), str(stats[key]), font=self.font_small, fill=0)
         
         # Success rate
         if stats['scraped'] > 0:
-            success_rate = int((stats['sent'] / stats['scraped']) * 100)
-            y += 25
+            success_rate = (100 * stats['sent']) // stats['scraped']
             emoji = "🔥" if success_rate > 80 else "👍" if success_rate > 60 else "😐"
-            draw.text((10, y), f"{emoji} Rate: {success_rate}%", font=self.font_small, fill=0)
+            draw.text((10, 96), f"{emoji} Rate: {success_rate}%", font=self.font_small, fill=0)
         
         # Uptime
-        uptime = datetime.now() - stats['uptime_start']
-        uptime_str = f"{uptime.days}d {uptime.seconds//3600}h"
-        draw.text((10, self.height - 35), f"⏰ Up: {uptime_str}", font=self.font_tiny, fill=0)
+        uptime_days, uptime_hours = _uptime_parts(stats['uptime_start'])
+        uptime_str = f"{uptime_days}d {uptime_hours}h"
+        draw.text((10, self._uptime_y), f"⏰ Up: {uptime_str}", font=self.font_tiny, fill=0)
         
         # Last run with face
         if stats['last_run']:
-            last_run_str = stats['last_run'].strftime("%H:%M")
-            face = random.choice(self.meme_faces)
-            draw.text((10, self.height - 20), f"Last: {last_run_str} {face}", font=self.font_tiny, fill=0)
+            last_run_str = datetime.fromtimestamp(stats['last_run']).strftime("%H:%M")
+            face = self._meme_face
+            draw.text((10, self._last_run_y), f"Last: {last_run_str} {face}", font=self.font_tiny, fill=0)
     
     def _draw_recent_memes(self, draw, stats):
         """Show recent memes with titles"""
-        self._draw_border(draw)
-        
-        draw.text((10, 8), "🔥 RECENT MEMES 🔥", font=self.font_medium, fill=0)
-        
         if stats['recent_memes']:
             y = 30
             for i, meme in enumerate(stats['recent_memes'][-3:]):  # Show last 3
@@ -413,17 +721,10 @@ class FunEInkDisplay:
     
     def _draw_subreddit_stats(self, draw, stats):
         """Show subreddit leaderboard"""
-        self._draw_border(draw)
-        
-        draw.text((10, 8), "🏆 TOP SUBREDDITS", font=self.font_medium, fill=0)
-        
-        if stats['subreddit_stats']:
-            # Sort by count
-            sorted_subs = sorted(stats['subreddit_stats'].items(), key=lambda x: x[1], reverse=True)
-            
+        if stats['top_subreddits']:
             y = 30
             medals = ["🥇", "🥈", "🥉", "4️⃣", "5️⃣"]
-            for i, (subreddit, count) in enumerate(sorted_subs[:5]):
+            for i, (subreddit, count) in enumerate(stats['top_subreddits']):
                 medal = medals[i] if i < len(medals) else "•"
                 text = f"{medal} r/{subreddit}: {count}"
                 draw.text((5, y), text, font=self.font_small, fill=0)
@@ -433,17 +734,15 @@ class FunEInkDisplay:
     
     def _draw_fun_status(self, draw, stats):
         """Fun status screen with animations"""
-        self._draw_border(draw)
-        
         # Determine status
         if stats['last_error']:
             status = "ERROR"
-            face = random.choice(self.error_faces)
+            face = self._error_face
             emoji = "💥"
         elif stats['sent'] > 0:
             status = "SENDING MEMES"
-            face = random.choice(self.meme_faces)
-            emoji = random.choice(self.success_emojis)
+            face = self._meme_face
+            emoji = self._success_emoji
         else:
             status = "WAITING..."
             face = "(･_･)"
@@ -453,8 +752,7 @@ class FunEInkDisplay:
         draw.text((10, 15), f"{emoji} {status}", font=self.font_large, fill=0)
         
         # Fun face
-        face_bbox = draw.textbbox((0, 0), face, font=self.font_medium)
-        face_width = face_bbox[2] - face_bbox[0]
+        face_width, _ = self._measure(face, self.font_medium)
         draw.text(((self.width - face_width) // 2, 45), face, font=self.font_medium, fill=0)
         
         # Meme counter
@@ -467,23 +765,19 @@ class FunEInkDisplay:
                 draw.text((10, 95), "🎉 MILESTONE! 🎉", font=self.font_small, fill=0)
         
         # Current time
-        now = datetime.now().strftime("%H:%M:%S")
-        draw.text((10, self.height - 15), now, font=self.font_tiny, fill=0)
+        now = time.strftime("%H:%M")
+        draw.text((10, self._footer_y), now, font=self.font_tiny, fill=0)
     
     def _draw_meme_display_stable(self, draw, stats):
-        """Display actual meme images with stable refresh"""
+        """Display actual meme images with stable refresh; True once the screen is final"""
         if not stats.get('recent_memes'):
             # No memes to display
-            image = self.Image.new('1', (self.width, self.height), 255)
-            draw = self.ImageDraw.Draw(image)
-            self._draw_border(draw)
-            draw.text((10, 8), "🎭 MEME DISPLAY 🎭", font=self.font_medium, fill=0)
+            image, draw = self._start_frame(self._templates[4])
             
-            face = random.choice(self.meme_faces)
+            face = self._meme_face
             draw.text((10, 50), f"No memes cached yet {face}", font=self.font_small, fill=0)
             draw.text((10, 70), "Check back soon!", font=self.font_small, fill=0)
-            self._smart_refresh(image)
-            return
+            return self._smart_refresh(image)
         
         # Get current meme
         recent_memes = stats['recent_memes']
@@ -497,12 +791,8 @@ class FunEInkDisplay:
             processed_img, meme_data = self._download_meme_image(current_meme)
             
             if processed_img:
-                # Clear display
-                image = self.Image.new('1', (self.width, self.height), 255)
-                draw = self.ImageDraw.Draw(image)
-                
-                # Draw border
-                draw.rectangle([0, 0, self.width-1, self.height-1], outline=0, width=1)
+                # Clear display and draw border
+                image, draw = self._start_frame(self._image_template)
                 
                 # Calculate position to center the image
                 img_x = (self.width - processed_img.width) // 2
@@ -520,19 +810,17 @@ class FunEInkDisplay:
                 
                 # Add info at bottom
                 info = f"r/{current_meme['subreddit']} • ⬆{current_meme['score']}"
-                draw.text((5, self.height - 15), info, font=self.font_tiny, fill=0)
+                draw.text((5, self._footer_y), info, font=self.font_tiny, fill=0)
                 
                 # Use smart refresh
                 if self._smart_refresh(image):
                     # Move to next meme only if refresh was successful
                     self.current_meme_index = (self.current_meme_index + 1) % len(recent_memes)
-                return
+                    return True
+                return False
         
         # Fallback if image download failed
-        image = self.Image.new('1', (self.width, self.height), 255)
-        draw = self.ImageDraw.Draw(image)
-        self._draw_border(draw)
-        draw.text((10, 8), "🎭 MEME DISPLAY 🎭", font=self.font_medium, fill=0)
+        image, draw = self._start_frame(self._templates[4])
         
         title = current_meme['title'][:25] + "..." if len(current_meme['title']) > 25 else current_meme['title']
         draw.text((10, 30), title, font=self.font_small, fill=0)
@@ -540,28 +828,42 @@ class FunEInkDisplay:
         draw.text((10, 70), f"⬆ {current_meme['score']} upvotes", font=self.font_small, fill=0)
         
         # Add a meme face
-        face = random.choice(self.meme_faces)
-        face_bbox = draw.textbbox((0, 0), face, font=self.font_large)
-        face_width = face_bbox[2] - face_bbox[0]
+        face = self._meme_face
+        face_width, _ = self._measure(face, self.font_large)
         draw.text(((self.width - face_width) // 2, 90), face, font=self.font_large, fill=0)
         
-        draw.text((10, self.height - 15), "Image download failed :(", font=self.font_tiny, fill=0)
+        draw.text((10, self._footer_y), "Image download failed :(", font=self.font_tiny, fill=0)
         self._smart_refresh(image)
+        return False  # Try the download again on the next update
     
     def _download_meme_image(self, meme_data):
         """Download and process a meme image for display"""
+        # The same few recent memes rotate through the screen, so reuse processed images
+        url = meme_data['url']
+        if url in self.cached_memes:
+            self.cached_memes.move_to_end(url)
+            return self.cached_memes[url], meme_data
+        
         try:
             import requests
-            from io import BytesIO
             
-            # Download the image
-            response = requests.get(meme_data['url'], timeout=10, headers={
+            # Download the image, streaming so oversized files are abandoned early
+            http = self.http or requests
+            with http.get(url, stream=True, timeout=10, headers={
                 'User-Agent': 'RedditMemeScraper/1.0'
-            })
-            response.raise_for_status()
+            }) as response:
+                response.raise_for_status()
+                data = BytesIO()
+                for chunk in response.iter_content(65536):
+                    data.write(chunk)
+                    if data.tell() > MAX_MEME_IMAGE_BYTES:
+                        raise ValueError(f"image larger than {MAX_MEME_IMAGE_BYTES // 1024} KB")
+            data.seek(0)
             
-            # Open and process the image
-            img = self.Image.open(BytesIO(response.content))
+            # Open and process the image; JPEGs are decoded straight to a
+            # reduced-scale grayscale image close to the panel size
+            img = self.Image.open(data)
+            img.draft('L', (self.width, self.height))
             
             # Convert to grayscale and resize to fit display
             img = img.convert('L')  # Grayscale
@@ -582,7 +884,11 @@ class FunEInkDisplay:
             img = img.resize((new_width, new_height), self.Image.Resampling.LANCZOS)
             
             # Convert to 1-bit for e-ink display
-            img = img.point(lambda x: 0 if x < 128 else 255, '1')
+            img = img.point(THRESHOLD_LUT, '1')
+            
+            self.cached_memes[url] = img
+            if len(self.cached_memes) > MEME_IMAGE_CACHE_SIZE:
+                self.cached_memes.popitem(last=False)
             
             return img, meme_data
             
@@ -590,45 +896,61 @@ class FunEInkDisplay:
             print(f"Failed to download meme image: {e}")
             return None, None
     
+    def close(self):
+        """Blank the panel and put it into deep sleep"""
+        try:
+            # A full init is needed to leave partial refresh mode before clearing
+            self.epd.init()
+            self.epd.Clear(0xFF)
+            self.epd.sleep()
+        except Exception as e:
+            print(f"Failed to shut down display: {e}")
+    
+    def seconds_until_refresh(self):
+        """Seconds before _smart_refresh will accept another frame"""
+        return max(0.0, self.last_refresh_time + self.min_refresh_interval - time.monotonic())
+    
     def _smart_refresh(self, image):
         """Smart refresh that uses partial refresh when possible and rate limits updates"""
-        import time
-        
-        current_time = time.time()
+        current_time = time.monotonic()
         
         # Rate limiting: don't update too frequently
         if current_time - self.last_refresh_time < self.min_refresh_interval:
             return False
         
         # Check if image actually changed (avoid unnecessary refreshes)
-        if self.previous_image:
-            # Simple comparison - convert both to bytes and compare
-            try:
-                if image.tobytes() == self.previous_image.tobytes():
-                    return False  # No change, skip refresh
-            except:
-                pass  # If comparison fails, proceed with refresh
+        frame_bytes = image.tobytes()
+        if frame_bytes == self.previous_frame:
+            return False  # No change, skip refresh
         
         # Determine refresh type
-        use_partial = (self.enable_partial_refresh and 
-                      hasattr(self.epd, 'displayPartial') and
+        use_partial = (self.enable_partial_refresh and
                       self.full_refresh_counter < self.full_refresh_every)
         
         try:
+            buffer = self._getbuffer(image)
             if use_partial:
                 # Use partial refresh (faster, less flicker)
-                if hasattr(self.epd, 'displayPartial'):
-                    self.epd.displayPartial(self.epd.getbuffer(image))
-                else:
-                    self.epd.display(self.epd.getbuffer(image))
+                self._display_partial(buffer)
+                self._partial_mode = True
                 self.full_refresh_counter += 1
             else:
-                # Use full refresh (clears ghosting)
-                self.epd.display(self.epd.getbuffer(image))
+                # Use full refresh (clears ghosting). displayPartial leaves the partial
+                # waveform loaded until the next init, so re-init first or this
+                # "full" refresh would still use the partial waveform.
+                if self._partial_mode:
+                    self._full_init()
+                
+                # With partial refresh on, the frame also becomes the base the
+                # following partial updates diff against
+                if self.enable_partial_refresh and self._display_base is not None:
+                    self._display_base(buffer)
+                else:
+                    self.epd.display(buffer)
                 self.full_refresh_counter = 0
                 
             self.last_refresh_time = current_time
-            self.previous_image = image.copy()
+            self.previous_frame = frame_bytes
             return True
             
         except Exception as e:
@@ -1,112 +1,194 @@
 import os
-import praw
+import asyncio
+import asyncpraw
 import logging
-from typing import List, Dict, Any
-from utils import is_image_url, load_sent_posts, save_sent_posts
+from asyncprawcore.exceptions import RequestException, ServerError, TooManyRequests
+from typing import List, Dict, Any, AsyncIterator
+from utils import is_image_url, SentStore, retry_async, backoff_delay
+
+# Reddit failures worth retrying per subreddit: connection errors, 5xx and 429
+TRANSIENT_REDDIT_ERRORS = (RequestException, ServerError, TooManyRequests)
 
 class RedditScraper:
     def __init__(self, config: Dict[str, Any]):
         self.config = config
         self.logger = logging.getLogger(__name__)
-        self.sent_posts = load_sent_posts()
+        self.sent_posts = SentStore()
+        
+        # Filters are checked for every post and fixed for the process, so resolve them once
+        filters = self.config.get('filters', {})
+        self.min_score = self.config.get('reddit', {}).get('min_score', 100)
+        self.exclude_nsfw = filters.get('exclude_nsfw', True)
+        self.max_title_length = filters.get('max_title_length', 200)
+        self.image_only = filters.get('image_only', True)
         
-        # Initialize Reddit instance
-        self.reddit = praw.Reddit(
-            client_id=os.getenv('REDDIT_CLIENT_ID'),
-            client_secret=os.getenv('REDDIT_CLIENT_SECRET'),
-            user_agent=os.getenv('REDDIT_USER_AGENT')
-        )
+        # Async PRAW opens its aiohttp session on creation, so the Reddit
+        # instance is created lazily inside the running event loop
+        self.reddit = None
         
         self.logger.info("Reddit scraper initialized")
     
+    def _get_reddit(self) -> asyncpraw.Reddit:
+        """Return the Reddit instance, creating it on first use"""
+        if self.reddit is None:
+            self.reddit = asyncpraw.Reddit(
+                client_id=os.getenv('REDDIT_CLIENT_ID'),
+                client_secret=os.getenv('REDDIT_CLIENT_SECRET'),
+                user_agent=os.getenv('REDDIT_USER_AGENT')
+            )
+        return self.reddit
+    
+    async def close(self):
+        """Close the Reddit session (it is recreated on the next scrape)"""
+        if self.reddit is not None:
+            await self.reddit.close()
+            self.reddit = None
+    
     def scrape_memes(self) -> List[Dict[str, Any]]:
+        """Scrape memes from configured subreddits (blocking wrapper)"""
+        async def scrape_once():
+            try:
+                return await self.scrape_memes_async()
+            finally:
+                await self.close()
+        
+        return asyncio.run(scrape_once())
+    
+    async def scrape_memes_async(self) -> List[Dict[str, Any]]:
         """Scrape memes from configured subreddits"""
-        memes = []
+        return [meme async for memes in self.scrape_memes_stream() for meme in memes]
+    
+    async def scrape_memes_stream(self) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Scrape memes from configured subreddits, yielding each subreddit's memes as it finishes"""
+        reddit = self._get_reddit()
         reddit_config = self.config.get('reddit', {})
-        filters = self.config.get('filters', {})
         
         subreddits = reddit_config.get('subreddits', ['memes'])
         sort_by = reddit_config.get('sort_by', 'hot')
         limit = reddit_config.get('limit', 10)
-        min_score = reddit_config.get('min_score', 100)
         
-        for subreddit_name in subreddits:
-            try:
-                self.logger.info(f"Scraping r/{subreddit_name}")
-                subreddit = self.reddit.subreddit(subreddit_name)
-                
-                # Get posts based on sorting method
-                if sort_by == 'hot':
-                    posts = subreddit.hot(limit=limit)
-                elif sort_by == 'new':
-                    posts = subreddit.new(limit=limit)
-                elif sort_by == 'top':
-                    posts = subreddit.top('day', limit=limit)
-                else:
-                    posts = subreddit.hot(limit=limit)
-                
-                for post in posts:
-                    # Skip if already sent
-                    if post.id in self.sent_posts:
-                        continue
-                    
-                    # Apply filters
-                    if not self._passes_filters(post, filters, min_score):
-                        continue
-                    
-                    # Extract meme data
-                    meme_data = self._extract_meme_data(post, subreddit_name)
-                    if meme_data:
-                        memes.append(meme_data)
-                        self.sent_posts.add(post.id)
-                        
-            except Exception as e:
-                self.logger.error(f"Error scraping r/{subreddit_name}: {e}")
-        
-        # Save updated sent posts
-        save_sent_posts(self.sent_posts)
-        
-        self.logger.info(f"Found {len(memes)} new memes")
+        # Fetch subreddits concurrently, but cap how many hit Reddit at once to stay
+        # under its rate limit. Created per scrape so it belongs to the running loop.
+        semaphore = asyncio.Semaphore(reddit_config.get('max_concurrency', 10))
+        
+        tasks = [
+            asyncio.ensure_future(self._scrape_subreddit(reddit, semaphore, subreddit_name, sort_by, limit))
+            for subreddit_name in subreddits
+        ]
+        found = 0
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                memes = await next_done
+                if memes:
+                    found += len(memes)
+                    yield memes
+        finally:
+            # Stop fetching if the caller gave up early
+            for task in tasks:
+                task.cancel()
+            
+            # Save updated sent posts
+            self.sent_posts.commit()
+        
+        self.logger.info(f"Found {found} new memes")
+    
+    async def _scrape_subreddit(self, reddit: asyncpraw.Reddit, semaphore: asyncio.Semaphore, subreddit_name: str,
+                                sort_by: str, limit: int) -> List[Dict[str, Any]]:
+        """Scrape new memes from a single subreddit, retrying transient failures"""
+        async def fetch():
+            async with semaphore:
+                return await self._fetch_subreddit(reddit, subreddit_name, sort_by, limit)
+        
+        def retry_delay(error: Exception, attempt: int):
+            return backoff_delay(attempt) if isinstance(error, TRANSIENT_REDDIT_ERRORS) else None
+        
+        try:
+            memes = await retry_async(fetch, retry_delay, self.logger, f"Scraping r/{subreddit_name}")
+        except Exception as e:
+            self.logger.error(f"Error scraping r/{subreddit_name}: {e}")
+            return []
+        
+        # Posts are only marked as sent once a fetch completes, so a failed attempt
+        # loses nothing. This runs without an await, so concurrent subreddits can't
+        # both take the same post.
+        memes = [meme for meme in memes if meme['id'] not in self.sent_posts]
+        self.sent_posts.update(meme['id'] for meme in memes)
+        return memes
+    
+    async def _fetch_subreddit(self, reddit: asyncpraw.Reddit, subreddit_name: str, sort_by: str,
+                               limit: int) -> List[Dict[str, Any]]:
+        """Fetch one listing and return the memes in it that haven't been sent"""
+        memes = []
+        self.logger.info(f"Scraping r/{subreddit_name}")
+        subreddit = await reddit.subreddit(subreddit_name)
+        
+        # Get posts based on sorting method
+        if sort_by == 'hot':
+            posts = subreddit.hot(limit=limit)
+        elif sort_by == 'new':
+            posts = subreddit.new(limit=limit)
+        elif sort_by == 'top':
+            posts = subreddit.top(time_filter='day', limit=limit)
+        else:
+            posts = subreddit.hot(limit=limit)
+        
+        async for post in posts:
+            # Skip if already sent
+            if post.id in self.sent_posts:
+                continue
+            
+            # Checked once here and shared by the filters and the extraction
+            is_image = is_image_url(post.url)
+            
+            # Apply filters
+            if not self._passes_filters(post, is_image):
+                continue
+            
+            # Extract meme data
+            meme_data = self._extract_meme_data(post, is_image, subreddit_name)
+            if meme_data:
+                memes.append(meme_data)
+        
         return memes
     
-    def _passes_filters(self, post, filters: Dict[str, Any], min_score: int) -> bool:
+    def _passes_filters(self, post, is_image: bool) -> bool:
         """Check if post passes all filters"""
         
         # Score filter
-        if post.score < min_score:
+        if post.score < self.min_score:
             return False
         
         # NSFW filter
-        if filters.get('exclude_nsfw', True) and post.over_18:
+        if self.exclude_nsfw and post.over_18:
             return False
         
         # Title length filter
-        max_title_length = filters.get('max_title_length', 200)
-        if len(post.title) > max_title_length:
+        if len(post.title) > self.max_title_length:
             return False
         
         # Image only filter
-        if filters.get('image_only', True):
-            if not (is_image_url(post.url) or hasattr(post, 'post_hint') and post.post_hint == 'image'):
+        if self.image_only:
+            if not (is_image or getattr(post, 'post_hint', None) == 'image'):
                 return False
         
         return True
     
-    def _extract_meme_data(self, post, subreddit_name: str) -> Dict[str, Any]:
+    def _extract_meme_data(self, post, is_image: bool, subreddit_name: str) -> Dict[str, Any]:
         """Extract relevant data from a Reddit post"""
         try:
             # Handle different types of image posts
             image_url = None
+            preview = getattr(post, 'preview', None)
             
-            if is_image_url(post.url):
+            if is_image:
                 image_url = post.url
-            elif hasattr(post, 'preview') and 'images' in post.preview:
+            elif preview and 'images' in preview:
                 # Get the highest resolution image
-                images = post.preview['images'][0]['resolutions']
+                images = preview['images'][0]['resolutions']
                 if images:
                     image_url = images[-1]['url'].replace('&amp;', '&')
                 else:
-                    image_url = post.preview['images'][0]['source']['url'].replace('&amp;', '&')
+                    image_url = preview['images'][0]['source']['url'].replace('&amp;', '&')
             elif post.url.startswith('https://i.redd.it/'):
                 image_url = post.url
             
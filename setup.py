@@ -67,16 +67,19 @@ def test_setup():
     
     # Test Reddit credentials
     try:
-        import praw
-        reddit = praw.Reddit(
-            client_id=os.getenv('REDDIT_CLIENT_ID'),
-            client_secret=os.getenv('REDDIT_CLIENT_SECRET'),
-            user_agent=os.getenv('REDDIT_USER_AGENT')
-        )
+        import asyncpraw
+        import asyncio
+        
+        async def test_reddit():
+            async with asyncpraw.Reddit(
+                client_id=os.getenv('REDDIT_CLIENT_ID'),
+                client_secret=os.getenv('REDDIT_CLIENT_SECRET'),
+                user_agent=os.getenv('REDDIT_USER_AGENT')
+            ) as reddit:
+                # Fetching the subreddit will fail if credentials are wrong
+                await reddit.subreddit('memes', fetch=True)
         
-        # Test by getting a subreddit
-        test_subreddit = reddit.subreddit('memes')
-        test_subreddit.display_name  # This will fail if credentials are wrong
+        asyncio.run(test_reddit())
         print("✅ Reddit API connection successful!")
         
     except Exception as e:
@@ -1,15 +1,84 @@
 import os
 import logging
 import asyncio
-from typing import List, Dict, Any
-from telegram import Bot
-from telegram.error import TelegramError
+import time
+import importlib.util
+import httpx
+from collections import deque, OrderedDict
+from typing import List, Dict, Any, Optional
+from telegram import Bot, InputMediaPhoto
+from telegram.error import TelegramError, RetryAfter, BadRequest, NetworkError
+from telegram.request import HTTPXRequest
+from utils import retry_async, backoff_delay
+
+# Default number of sends kept in flight at once (telegram.concurrency);
+# it also sizes the bot's connection pool
+DEFAULT_CONCURRENT_SENDS = 3
+
+# Largest album Telegram accepts in one sendMediaGroup call
+MEDIA_GROUP_SIZE = 10
+
+# Pause after each Telegram call, adapted AIMD-style: it shrinks by a fixed step
+# while sends succeed and doubles whenever Telegram answers with flood control
+INITIAL_SEND_DELAY = 1.0
+MIN_SEND_DELAY = 0.2
+MAX_SEND_DELAY = 5.0
+SEND_DELAY_STEP = 0.05
+
+# httpx failures that mean a request never reached Telegram. Only these are
+# resent: after any other network error (a read timeout above all) the message
+# may already be posted, and sending it again would post a duplicate.
+UNSENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+# Seconds to wait for Telegram's answer. A photo sent by URL is only answered
+# once Telegram has fetched the image, which often takes longer than PTB's 5 s.
+SEND_READ_TIMEOUT = 30.0
+
+# Telegram allows about 20 messages a minute into a group; the sliding window
+# holds sends back before that is hit (telegram.max_messages_per_minute).
+# An album counts as one message per photo.
+DEFAULT_MESSAGES_PER_MINUTE = 20
+RATE_WINDOW_SECONDS = 60.0
+
+# Uploads used when Telegram can't fetch an image URL itself: Telegram's upload
+# limit for photos, and how many downloads are kept for retries and fallbacks
+MAX_UPLOAD_BYTES = 10 * 1024 * 1024
+UPLOAD_CACHE_SIZE = 8
+
+# HTTP/2 lets concurrent sends share one connection; it needs the optional h2 package
+HTTP_VERSION = '2' if importlib.util.find_spec('h2') else '1.1'
 
 class TelegramSender:
     def __init__(self, config: Dict[str, Any]):
         self.config = config
         self.logger = logging.getLogger(__name__)
         
+        # Sending options are fixed for the process, so resolve them once
+        telegram_config = self.config.get('telegram') or {}
+        self.enabled = telegram_config.get('enabled', True)
+        self.group_media = telegram_config.get('group_media', False)
+        self.concurrency = max(1, int(telegram_config.get('concurrency', DEFAULT_CONCURRENT_SENDS)))
+        self.messages_per_minute = max(1, int(telegram_config.get('max_messages_per_minute', DEFAULT_MESSAGES_PER_MINUTE)))
+        
+        # Kept across batches so the learned pace carries over between runs
+        self._send_delay = INITIAL_SEND_DELAY
+        
+        # Monotonic times of recent messages, and when flood control lifts
+        self._window = deque()
+        self._resume_at = 0.0
+        
+        # Connection pool shared by every batch, created inside the running loop
+        self._request: Optional[HTTPXRequest] = None
+        self._bot: Optional[Bot] = None
+        self._http: Optional[httpx.AsyncClient] = None
+        
+        # Image bytes by meme id for the current batch, so a retried upload
+        # doesn't download again (LRU); sent ids never return, so it's cleared per batch
+        self._uploads = OrderedDict()
+        
+        # Captions by meme id for the current batch; fallbacks and retries reuse them
+        self._captions: Dict[str, str] = {}
+        
         # Initialize Telegram bot
         self.bot_token = os.getenv('TELEGRAM_BOT_TOKEN')
         self.chat_id = os.getenv('TELEGRAM_CHAT_ID')
@@ -19,39 +88,173 @@ class TelegramSender:
         
         self.logger.info("Telegram sender initialized")
     
-    def send_memes(self, memes: List[Dict[str, Any]]):
-        """Send memes via Telegram"""
-        if not self.config.get('telegram', {}).get('enabled', True):
+    def _get_bot(self) -> Bot:
+        """Return the bot, creating it and its connection pool on first use"""
+        if self._bot is None:
+            self._request = HTTPXRequest(
+                connection_pool_size=self.concurrency,
+                read_timeout=SEND_READ_TIMEOUT,
+                http_version=HTTP_VERSION
+            )
+            self._bot = Bot(token=self.bot_token, request=self._request)
+        return self._bot
+    
+    def _get_http(self) -> httpx.AsyncClient:
+        """Return the client used to download images, creating it on first use"""
+        if self._http is None:
+            self._http = httpx.AsyncClient(
+                headers={'User-Agent': 'RedditMemeScraper/1.0'},
+                follow_redirects=True,
+                timeout=30
+            )
+        return self._http
+    
+    async def close(self):
+        """Close the HTTP connection pools (they are recreated on the next send)"""
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+        if self._request is not None:
+            try:
+                await self._request.shutdown()
+            except Exception as e:
+                self.logger.debug(f"Error closing HTTP client: {e}")
+            self._request = None
+            self._bot = None
+    
+    def send_memes(self, memes: List[Dict[str, Any]]) -> List[Optional[Exception]]:
+        """Send memes via Telegram (blocking wrapper around send_memes_async)"""
+        async def send_once():
+            try:
+                return await self.send_memes_async(memes)
+            finally:
+                await self.close()
+        
+        return asyncio.run(send_once())
+    
+    async def send_memes_async(self, memes: List[Dict[str, Any]]) -> List[Optional[Exception]]:
+        """Send memes via Telegram, returning one result per meme (None on success)"""
+        if not self.enabled:
             self.logger.info("Telegram sending is disabled")
-            return
+            return []
         
         if not memes:
             self.logger.info("No memes to send")
-            return
+            return []
         
-        # Run async function in sync context
-        asyncio.run(self._send_memes_async(memes))
-    
-    async def _send_memes_async(self, memes: List[Dict[str, Any]]):
-        """Async function to send memes"""
-        # Create a fresh bot instance for this batch to avoid connection pool issues
-        bot = Bot(token=self.bot_token)
+        bot = self._get_bot()
+        semaphore = asyncio.Semaphore(self.concurrency)
         
-        try:
-            for meme in memes:
+        async def send_one(meme: Dict[str, Any]):
+            async with semaphore:
                 try:
-                    await self._send_single_meme(bot, meme)
-                    # Small delay between messages to avoid rate limiting
-                    await asyncio.sleep(1)
+                    await self._paced(lambda: self._send_single_meme(bot, meme))
                 except Exception as e:
                     self.logger.error(f"Failed to send meme {meme['id']}: {e}")
+                    raise
+        
+        async def send_group(group: List[Dict[str, Any]]):
+            if len(group) > 1:
+                async with semaphore:
+                    try:
+                        await self._paced(lambda: self._send_media_group(bot, group), len(group))
+                        return [None] * len(group)
+                    except Exception as e:
+                        if self._maybe_delivered(e):
+                            # The album may already be posted; resending its memes could duplicate them
+                            self.logger.error(f"Album of {len(group)} memes failed: {e}")
+                            return [e] * len(group)
+                        self.logger.warning(f"Album of {len(group)} memes failed, sending individually: {e}")
+            
+            # Single memes and failed albums go through the per-meme fallbacks
+            return await asyncio.gather(*(send_one(meme) for meme in group), return_exceptions=True)
+        
+        try:
+            if self.group_media:
+                groups = [memes[i:i + MEDIA_GROUP_SIZE] for i in range(0, len(memes), MEDIA_GROUP_SIZE)]
+                group_results = await asyncio.gather(*(send_group(group) for group in groups))
+                results = [result for group in group_results for result in group]
+            else:
+                results = await asyncio.gather(
+                    *(send_one(meme) for meme in memes),
+                    return_exceptions=True
+                )
+            return [result if isinstance(result, Exception) else None for result in results]
         finally:
-            # Clean up the bot instance
-            try:
-                if hasattr(bot, '_httpx_client') and bot._httpx_client:
-                    await bot._httpx_client.aclose()
-            except Exception as e:
-                self.logger.debug(f"Error closing HTTP client: {e}")
+            self._captions.clear()
+            self._uploads.clear()
+    
+    async def _throttle(self, messages: int):
+        """Wait until the rate window has room for this many messages, then claim it"""
+        messages = min(messages, self.messages_per_minute)
+        while True:
+            now = time.monotonic()
+            while self._window and self._window[0] <= now - RATE_WINDOW_SECONDS:
+                self._window.popleft()
+            
+            if now < self._resume_at:
+                delay = self._resume_at - now
+            elif len(self._window) + messages > self.messages_per_minute:
+                delay = self._window[len(self._window) + messages - self.messages_per_minute - 1] + RATE_WINDOW_SECONDS - now
+            else:
+                # No await between the check and the claim, so concurrent sends can't overbook
+                self._window.extend([now] * messages)
+                return
+            
+            self.logger.debug(f"Telegram rate window full, waiting {delay:.1f}s")
+            await asyncio.sleep(delay)
+    
+    async def _paced(self, send, messages: int = 1):
+        """Run one Telegram call with retries, then pause for the adaptive send delay"""
+        async def attempt():
+            await self._throttle(messages)
+            await send()
+        
+        try:
+            await retry_async(attempt, self._retry_delay, self.logger, "Telegram send")
+            self._send_delay = max(MIN_SEND_DELAY, self._send_delay - SEND_DELAY_STEP)
+        finally:
+            # Pause before freeing the slot to stay under Telegram's rate limits
+            await asyncio.sleep(self._send_delay)
+    
+    def _retry_delay(self, error: Exception, attempt: int) -> Optional[float]:
+        """Return how long to wait before resending after an error, or None if it is final"""
+        if isinstance(error, RetryAfter):
+            # Flood control: back off multiplicatively and hold every
+            # concurrent send, not just this one, until it lifts
+            self._send_delay = min(MAX_SEND_DELAY, self._send_delay * 2)
+            self._resume_at = max(self._resume_at, time.monotonic() + error.retry_after)
+            return error.retry_after
+        
+        # Rejected requests (bad chat id, bad markup) will not succeed on retry,
+        # and ones that may have been delivered must not be repeated
+        if isinstance(error, NetworkError) and isinstance(error.__cause__, UNSENT_ERRORS):
+            return backoff_delay(attempt)
+        return None
+    
+    @staticmethod
+    def _maybe_delivered(error: Exception) -> bool:
+        """Check if a failed call may still have posted its message"""
+        return (
+            isinstance(error, NetworkError)
+            and not isinstance(error, BadRequest)
+            and not isinstance(error.__cause__, UNSENT_ERRORS)
+        )
+    
+    async def _send_media_group(self, bot: Bot, memes: List[Dict[str, Any]]):
+        """Send up to MEDIA_GROUP_SIZE memes as a single album"""
+        media = [
+            InputMediaPhoto(
+                media=meme['image_url'],
+                caption=self._format_caption(meme),
+                parse_mode='Markdown'
+            )
+            for meme in memes
+        ]
+        
+        await bot.send_media_group(chat_id=self.chat_id, media=media)
+        
+        self.logger.info(f"Sent album of {len(memes)} memes")
     
     async def _send_single_meme(self, bot: Bot, meme: Dict[str, Any]):
         """Send a single meme"""
@@ -59,7 +262,8 @@ class TelegramSender:
             # Prepare caption
             caption = self._format_caption(meme)
             
-            # Send photo with caption
+            # Send photo with caption. Passing the URL lets Telegram fetch the
+            # image itself, so image bytes only pass through the scraper if that fails.
             await bot.send_photo(
                 chat_id=self.chat_id,
                 photo=meme['image_url'],
@@ -70,24 +274,78 @@ class TelegramSender:
             self.logger.info(f"Sent meme: {meme['title'][:50]}...")
             
         except TelegramError as e:
-            if "photo_invalid_dimensions" in str(e) or "failed to get HTTP URL content" in str(e):
+            if "failed to get HTTP URL content" in str(e):
+                # Telegram couldn't fetch the image itself, so download and upload it
+                data = await self._download_image(meme)
+                if data is not None and await self._upload_photo(bot, meme, data):
+                    return
+                await self._send_as_document(bot, meme, data)
+            elif "photo_invalid_dimensions" in str(e):
                 # Try sending as document if photo fails
                 await self._send_as_document(bot, meme)
             else:
                 raise e
     
-    async def _send_as_document(self, bot: Bot, meme: Dict[str, Any]):
+    async def _download_image(self, meme: Dict[str, Any]) -> Optional[bytes]:
+        """Download a meme's image for upload, or None if it can't be fetched"""
+        data = self._uploads.get(meme['id'])
+        if data is not None:
+            self._uploads.move_to_end(meme['id'])
+            return data
+        
+        try:
+            async with self._get_http().stream('GET', meme['image_url']) as response:
+                response.raise_for_status()
+                chunks = []
+                size = 0
+                async for chunk in response.aiter_bytes():
+                    size += len(chunk)
+                    if size > MAX_UPLOAD_BYTES:
+                        self.logger.warning(f"Image for meme {meme['id']} is too large to upload")
+                        return None
+                    chunks.append(chunk)
+        except httpx.HTTPError as e:
+            self.logger.warning(f"Could not download image for meme {meme['id']}: {e}")
+            return None
+        
+        data = b''.join(chunks)
+        self._uploads[meme['id']] = data
+        if len(self._uploads) > UPLOAD_CACHE_SIZE:
+            self._uploads.popitem(last=False)
+        return data
+    
+    async def _upload_photo(self, bot: Bot, meme: Dict[str, Any], data: bytes) -> bool:
+        """Upload downloaded image bytes as a photo, returning whether it was sent"""
+        try:
+            await bot.send_photo(
+                chat_id=self.chat_id,
+                photo=data,
+                caption=self._format_caption(meme),
+                parse_mode='Markdown'
+            )
+        except BadRequest as e:
+            self.logger.debug(f"Photo upload rejected for meme {meme['id']}: {e}")
+            return False
+        
+        self._uploads.pop(meme['id'], None)
+        self.logger.info(f"Sent meme as upload: {meme['title'][:50]}...")
+        return True
+    
+    async def _send_as_document(self, bot: Bot, meme: Dict[str, Any], data: Optional[bytes] = None):
         """Send meme as document if photo sending fails"""
         try:
             caption = self._format_caption(meme)
             
+            # Downloaded bytes are uploaded; otherwise Telegram fetches the URL
             await bot.send_document(
                 chat_id=self.chat_id,
-                document=meme['image_url'],
+                document=meme['image_url'] if data is None else data,
+                filename=None if data is None else meme['image_url'].split('?')[0].rsplit('/', 1)[-1],
                 caption=caption,
                 parse_mode='Markdown'
             )
             
+            self._uploads.pop(meme['id'], None)
             self.logger.info(f"Sent meme as document: {meme['title'][:50]}...")
             
         except TelegramError as e:
@@ -113,9 +371,14 @@ class TelegramSender:
             
         except Exception as e:
             self.logger.error(f"All sending methods failed for meme {meme['id']}: {e}")
+            raise
     
     def _format_caption(self, meme: Dict[str, Any]) -> str:
         """Format caption for the meme"""
+        caption = self._captions.get(meme['id'])
+        if caption is not None:
+            return caption
+        
         caption = f"*{meme['title']}*\n\n"
         caption += f"📍 r/{meme['subreddit']}\n"
         caption += f"⬆️ {meme['score']} upvotes\n"
@@ -126,4 +389,5 @@ class TelegramSender:
         if len(caption) > 1024:
             caption = caption[:1020] + "..."
         
+        self._captions[meme['id']] = caption
         return caption 
\ No newline at end of file
@@ -7,6 +7,8 @@ Designed to refresh old images, test functionality, and remove ghosting
 import time
 import sys
 import os
+import importlib
+import importlib.util
 from PIL import Image, ImageDraw, ImageFont
 
 def detect_display_model():
@@ -21,10 +23,19 @@ def detect_display_model():
     
     print("🔍 Detecting display model...")
     
+    # Checking for the package first avoids a failed import per missing model
+    if importlib.util.find_spec('waveshare_epd') is None:
+        print("   ❌ waveshare_epd library not installed")
+        print("❌ No compatible display found!")
+        return None, None
+    
     for model, description in models_to_try:
         try:
             print(f"   Trying {model} ({description})...")
-            module = __import__(f'waveshare_epd.{model}', fromlist=[model])
+            if importlib.util.find_spec(f'waveshare_epd.{model}') is None:
+                print(f"   ❌ Module {model} not available")
+                continue
+            module = importlib.import_module(f'waveshare_epd.{model}')
             epd_class = getattr(module, 'EPD')
             epd = epd_class()
             print(f"✅ Found: {model}")
@@ -65,11 +76,15 @@ def aggressive_clean(epd, model):
         black_img = Image.new('1', (width, height), 0)   # Black
         white_img = Image.new('1', (width, height), 255) # White
         
+        # The images never change, so convert them to display buffers once
+        black_buffer = epd.getbuffer(black_img)
+        white_buffer = epd.getbuffer(white_img)
+        
         for i in range(10):
             print(f"      Flash cycle {i+1}/10")
-            epd.display(epd.getbuffer(black_img))
+            epd.display(black_buffer)
             time.sleep(0.5)
-            epd.display(epd.getbuffer(white_img))
+            epd.display(white_buffer)
             time.sleep(0.5)
         
         # Step 3: Gradient patterns to exercise all pixels
@@ -94,28 +109,37 @@ def aggressive_clean(epd, model):
 
 def create_test_pattern(width, height, pattern_type):
     """Create various test patterns"""
-    img = Image.new('1', (width, height), 255)
-    draw = ImageDraw.Draw(img)
+    # Patterns are assembled from a few precomputed pixel rows instead of being
+    # drawn rectangle by rectangle
+    white = bytes([255]) * width
+    black = bytes(width)
     
     if pattern_type == 'vertical':
         # Vertical stripes
-        for x in range(0, width, 20):
-            draw.rectangle([x, 0, x+10, height], fill=0)
+        stripes = bytes(0 if x % 20 <= 10 else 255 for x in range(width))
+        rows = [stripes] * height
     
     elif pattern_type == 'horizontal':
         # Horizontal stripes  
-        for y in range(0, height, 20):
-            draw.rectangle([0, y, width, y+10], fill=0)
+        rows = [black if y % 20 <= 10 else white for y in range(height)]
     
     elif pattern_type == 'checkerboard':
-        # Checkerboard pattern
+        # Checkerboard pattern. Squares span square_size + 1 pixels, so every
+        # grid line after the first is black.
         square_size = 20
-        for x in range(0, width, square_size):
-            for y in range(0, height, square_size):
-                if ((x // square_size) + (y // square_size)) % 2:
-                    draw.rectangle([x, y, x+square_size, y+square_size], fill=0)
+        even_row, odd_row = (
+            bytes(0 if (x // square_size + parity) % 2 or (x > 0 and x % square_size == 0) else 255 for x in range(width))
+            for parity in (0, 1)
+        )
+        rows = [
+            black if y > 0 and y % square_size == 0 else odd_row if (y // square_size) % 2 else even_row
+            for y in range(height)
+        ]
     
-    return img
+    else:
+        rows = [white] * height
+    
+    return Image.frombytes('L', (width, height), b''.join(rows)).convert('1')
 
 def create_test_display(width, height, model):
     """Create a comprehensive test display"""
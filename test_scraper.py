@@ -6,8 +6,6 @@ Run this to test your setup without starting the full scheduler
 
 import os
 from dotenv import load_dotenv
-from reddit_scraper import RedditScraper
-from telegram_sender import TelegramSender
 from utils import setup_logging, load_config
 
 def test_scraper():
@@ -25,6 +23,10 @@ def test_scraper():
         config = load_config()
         logger.info("✅ Configuration loaded successfully")
         
+        # Imported only once the config is valid; these pull in the Reddit and Telegram clients
+        from reddit_scraper import RedditScraper
+        from telegram_sender import TelegramSender
+        
         # Initialize components
         reddit_scraper = RedditScraper(config)
         logger.info("✅ Reddit scraper initialized")
@@ -40,13 +42,17 @@ def test_scraper():
             logger.info(f"✅ Found {len(memes)} memes!")
             
             # Show meme details
-            for i, meme in enumerate(memes[:3], 1):  # Show first 3 memes
+            sample = memes[:3]  # First 3 memes, shown and then sent
+            for i, meme in enumerate(sample, 1):
                 logger.info(f"  Meme {i}: {meme['title'][:50]}... (r/{meme['subreddit']}, {meme['score']} upvotes)")
             
-            # Test sending (only first meme)
+            # Test sending the memes shown above as one batch, through the same
+            # concurrent path the scheduler uses
             logger.info("📱 Testing Telegram sending...")
-            telegram_sender.send_memes([memes[0]])
-            logger.info("✅ Test meme sent successfully!")
+            for error in telegram_sender.send_memes(sample):
+                if error is not None:
+                    raise error
+            logger.info(f"✅ {len(sample)} test meme(s) sent successfully!")
             
         else:
             logger.warning("⚠️ No memes found. Try lowering min_score in config.json")
@@ -1,61 +1,134 @@
 import json
 import logging
 import os
-from typing import Dict, Any
+import re
+import queue
+import atexit
+import random
+import asyncio
+import sqlite3
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Any, Iterable, Callable, Awaitable, Optional
+
+try:
+    import orjson  # Optional: faster JSON encoding and decoding
+except ImportError:
+    orjson = None
 
 def setup_logging() -> logging.Logger:
     """Setup logging configuration"""
     # Determine log file location
     if os.getenv('INVOCATION_ID'):  # Running under systemd
         log_file = '/var/log/reddit-meme-scraper.log'
-        # Try to create the log file with proper permissions
-        try:
-            with open(log_file, 'a') as f:
-                pass
-        except PermissionError:
+        # Check write permission on the file, or on its directory if it doesn't exist yet
+        target = log_file if os.path.exists(log_file) else os.path.dirname(log_file)
+        if not os.access(target, os.W_OK):
             # Fall back to user's home directory
             log_file = os.path.expanduser('~/reddit_meme_scraper.log')
     else:
         # Running manually, use current directory
         log_file = 'meme_scraper.log'
     
+    # Records are formatted by the caller and written by a background thread,
+    # so logging never blocks the event loop on disk or console I/O
+    log_queue = queue.Queue(-1)
+    listener = QueueListener(log_queue, logging.FileHandler(log_file), logging.StreamHandler())
+    
     logging.basicConfig(
         level=logging.INFO,
         format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.FileHandler(log_file),
-            logging.StreamHandler()
-        ]
+        handlers=[QueueHandler(log_queue)]
     )
     
+    listener.start()
+    atexit.register(listener.stop)  # Flush queued records on exit
+    
     logger = logging.getLogger(__name__)
     logger.info(f"Logging to: {log_file}")
     return logger
 
+def dumps_json(obj: Any) -> bytes:
+    """Serialize to UTF-8 JSON bytes, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode('utf-8')
+
+def loads_json(data: bytes) -> Any:
+    """Parse JSON bytes, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+# Retries for transient network failures, with capped exponential backoff and
+# full jitter between attempts (shared by Reddit, Telegram and webhook calls)
+RETRY_MAX_ATTEMPTS = 4
+RETRY_BACKOFF_BASE = 1.0
+RETRY_BACKOFF_CAP = 30.0
+
+def backoff_delay(attempt: int) -> float:
+    """Return a full-jitter delay to wait after the given (0-based) failed attempt"""
+    return random.uniform(0, min(RETRY_BACKOFF_CAP, RETRY_BACKOFF_BASE * 2 ** attempt))
+
+async def retry_async(call: Callable[[], Awaitable[Any]], retry_delay: Callable[[Exception, int], Optional[float]],
+                      logger: logging.Logger, description: str) -> Any:
+    """Await call(), retrying while retry_delay(error, attempt) returns a delay in seconds"""
+    for attempt in range(RETRY_MAX_ATTEMPTS):
+        try:
+            return await call()
+        except Exception as e:
+            delay = retry_delay(e, attempt)
+            if delay is None or attempt == RETRY_MAX_ATTEMPTS - 1:
+                raise
+            logger.warning(f"{description} failed ({e}), retrying in {delay:.1f}s")
+            await asyncio.sleep(delay)
+
 def load_config() -> Dict[str, Any]:
     """Load configuration from config.json"""
     try:
-        with open('config.json', 'r') as f:
-            return json.load(f)
+        with open('config.json', 'rb') as f:
+            return loads_json(f.read())
     except FileNotFoundError:
         raise FileNotFoundError("config.json not found. Please create it based on the example.")
     except json.JSONDecodeError:
         raise ValueError("Invalid JSON in config.json")
 
+# Image file extension at the end of the URL path, before any query or fragment
+IMAGE_URL_PATTERN = re.compile(r'\.(?:jpe?g|png|gif|webp)(?:[?#]|$)', re.IGNORECASE)
+
 def is_image_url(url: str) -> bool:
     """Check if URL points to an image"""
-    image_extensions = ('.jpg', '.jpeg', '.png', '.gif', '.webp')
-    return any(url.lower().endswith(ext) for ext in image_extensions)
+    return IMAGE_URL_PATTERN.search(url) is not None
 
-def load_sent_posts() -> set:
-    """Load previously sent post IDs"""
-    try:
-        with open('sent_posts.json', 'r') as f:
-            return set(json.load(f))
-    except FileNotFoundError:
-        return set()
-
-def save_sent_posts(sent_posts: set):
-    """Save sent post IDs to prevent duplicates"""
-    with open('sent_posts.json', 'w') as f:
-        json.dump(list(sent_posts), f) 
\ No newline at end of file
+class SentStore:
+    """Post IDs that have already been sent, kept in a SQLite file"""
+    
+    def __init__(self, path: str = 'sent_posts.db', legacy_path: str = 'sent_posts.json'):
+        self._conn = sqlite3.connect(path)
+        
+        # WAL appends each commit to a log instead of rewriting pages in place, and
+        # NORMAL only syncs at checkpoints; a crash can lose at most the last scrape
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute('CREATE TABLE IF NOT EXISTS sent (id TEXT PRIMARY KEY)')
+        
+        # Carry over IDs from the old JSON list the first time the database is used
+        empty = self._conn.execute('SELECT 1 FROM sent LIMIT 1').fetchone() is None
+        if empty and os.path.exists(legacy_path):
+            with open(legacy_path, 'rb') as f:
+                self.update(loads_json(f.read()))
+            self.commit()
+    
+    def __contains__(self, post_id: str) -> bool:
+        return self._conn.execute('SELECT 1 FROM sent WHERE id = ?', (post_id,)).fetchone() is not None
+    
+    def update(self, post_ids: Iterable[str]):
+        """Mark post IDs as sent (written on the next commit)"""
+        self._conn.executemany('INSERT OR IGNORE INTO sent (id) VALUES (?)', ((post_id,) for post_id in post_ids))
+    
+    def commit(self):
+        """Write pending IDs to disk"""
+        self._conn.commit()
+    
+    def close(self):
+        self._conn.commit()
+        self._conn.close()